@@ -1,21 +1,40 @@
 # scripts/ingest.py
-import json, re, time, hashlib, random, feedparser, requests
+import asyncio, heapq, json, os, re, time, hashlib, random, aiohttp, feedparser
+from collections import defaultdict
+from functools import lru_cache
+from operator import itemgetter
 from urllib.parse import urlparse, quote
+from urllib.robotparser import RobotFileParser
 from datetime import datetime, timezone, timedelta
-from bs4 import BeautifulSoup
-from http.client import RemoteDisconnected
-from requests.exceptions import RequestException, ChunkedEncodingError, ConnectionError as ReqConnError
+from bs4 import BeautifulSoup, SoupStrainer
+
+try:
+  import orjson
+except ImportError:  # local runs without the CI deps; same byte-level API
+  class orjson:
+    OPT_INDENT_2 = 1
+    @staticmethod
+    def dumps(obj, option=0):
+      return json.dumps(obj, indent=2 if option else None).encode()
+    @staticmethod
+    def loads(data):
+      return json.loads(data)
 
 INSIGHTS_PATH = "public/data/insights.json"
+INSIGHTS_JSONL_PATH = "public/data/insights.jsonl"
+HTTP_CACHE_PATH = "public/data/http_cache.json"
 
 # -------- Config --------
 WINDOW_DAYS = 365
 CUTOFF = datetime.now(timezone.utc) - timedelta(days=WINDOW_DAYS)
 
+COMPACT_AT = 5000  # rewrite the JSONL store once it grows past this many rows
+
 HTTP_TIMEOUT = 18
-SLEEP_BETWEEN_REQUESTS = 0.4
 MAX_RETRIES = 4
 BACKOFF_BASE = 0.8
+PER_HOST_CONCURRENCY = 8
+PER_HOST_MIN_GAP = 0.4  # seconds between requests to the same host
 UA = "CI-App/1.0 (+github-actions; contact: ci-bot@noreply)"
 
 COMPETITOR_MAP = {
@@ -39,64 +58,202 @@ RSS_SOURCES = [
 ]
 
 # -------- HTTP helpers --------
-def sleep_polite():
-  time.sleep(SLEEP_BETWEEN_REQUESTS + random.random() * 0.2)
+# One semaphore per host keeps us polite per-site while unrelated hosts
+# proceed concurrently (replaces the old global sleep between requests).
+HOST_SEMA = defaultdict(lambda: asyncio.Semaphore(PER_HOST_CONCURRENCY))
+HOST_LAST = defaultdict(float)  # host -> monotonic time of last request
 
-def fetch_text(url):
-  for attempt in range(1, MAX_RETRIES + 1):
-    try:
-      sleep_polite()
-      r = requests.get(url, headers={"User-Agent": UA}, timeout=HTTP_TIMEOUT)
-      r.raise_for_status()
-      return r.text
-    except (RemoteDisconnected, ChunkedEncodingError, ReqConnError, RequestException) as e:
-      if attempt == MAX_RETRIES:
-        print(f"[warn] fetch failed: {url} :: {e}")
-        return None
-      time.sleep(BACKOFF_BASE * (2 ** (attempt - 1)))
+# Sentinel returned on HTTP 304 so callers can tell "unchanged since last
+# run" apart from a failed fetch.
+UNCHANGED = object()
+
+def load_http_cache():
+  try:
+    with open(HTTP_CACHE_PATH) as f:
+      return json.load(f)
+  except Exception:
+    return {}
+
+HTTP_CACHE = load_http_cache()
+
+def save_http_cache():
+  with open(HTTP_CACHE_PATH, "w") as f:
+    json.dump(HTTP_CACHE, f, indent=2)
+
+# track_body: also fingerprint the response body so endpoints that ignore
+# conditional headers (Google News) still report UNCHANGED on identical
+# payloads. Only used for feed URLs — fingerprinting every article would
+# bloat the committed cache for URLs we never refetch.
+async def fetch_bytes(session, url, track_body=False):
+  host = urlparse(url).netloc
+  headers = {}
+  cached = HTTP_CACHE.get(url)
+  if cached:
+    if cached.get("etag"): headers["If-None-Match"] = cached["etag"]
+    if cached.get("last_modified"): headers["If-Modified-Since"] = cached["last_modified"]
+  async with HOST_SEMA[host]:
+    # Token-bucket politeness: reserve the next send slot for this host
+    # before sleeping, so concurrent permit-holders serialize on the
+    # timestamp instead of all reading the same HOST_LAST and waking at
+    # once. Unrelated hosts never wait on each other.
+    now = time.monotonic()
+    slot = max(now, HOST_LAST[host] + PER_HOST_MIN_GAP)
+    HOST_LAST[host] = slot
+    if slot > now: await asyncio.sleep(slot - now)
+    for attempt in range(1, MAX_RETRIES + 1):
+      try:
+        async with session.get(url, headers=headers) as r:
+          if r.status == 304:
+            return UNCHANGED
+          if r.status in (429, 503):
+            # Rate-limited: the server states when to come back, so honour
+            # Retry-After instead of guessing with blind exponential backoff.
+            if attempt == MAX_RETRIES:
+              print(f"[warn] fetch failed: {url} :: HTTP {r.status}")
+              return None
+            delay = BACKOFF_BASE * (2 ** (attempt - 1)) * (1 + random.random() * 0.3)
+            try:
+              # Clamp the server-stated delay: ClientTimeout doesn't cover
+              # this sleep, and a bogus Retry-After must not park the run.
+              delay = min(float(r.headers.get("Retry-After") or delay), 60.0)
+            except ValueError:
+              pass
+            await asyncio.sleep(delay)
+            continue
+          if 400 <= r.status < 500:
+            # Other client errors (404/410/403/...) never succeed on retry;
+            # fail fast instead of burning the full backoff schedule.
+            return None
+          r.raise_for_status()
+          body = await r.read()
+          if track_body:
+            digest = hashlib.sha1(body).hexdigest()
+            if cached and cached.get("body_sha1") == digest:
+              return UNCHANGED
+            HTTP_CACHE[url] = {"etag": r.headers.get("ETag"),
+                               "last_modified": r.headers.get("Last-Modified"),
+                               "body_sha1": digest}
+          elif r.headers.get("ETag") or r.headers.get("Last-Modified"):
+            HTTP_CACHE[url] = {"etag": r.headers.get("ETag"),
+                               "last_modified": r.headers.get("Last-Modified")}
+          return body
+      except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+        if attempt == MAX_RETRIES:
+          print(f"[warn] fetch failed: {url} :: {e}")
+          return None
+        # Jitter desynchronizes retries when a gather hits one host in bulk.
+        await asyncio.sleep(BACKOFF_BASE * (2 ** (attempt - 1)) * (1 + random.random() * 0.3))
   return None
 
+# robots.txt is fetched once per article host and cached for the run.
+# Fail-open: a missing or unreachable robots.txt allows the fetch, so a
+# flaky host can't silently blank out a source.
+_ROBOTS = {}
+
+async def allowed_by_robots(session, url):
+  host = urlparse(url).netloc
+  rp = _ROBOTS.get(host)
+  if rp is None:
+    rp = RobotFileParser()
+    lines = []
+    try:
+      async with session.get(f"https://{host}/robots.txt",
+                             timeout=aiohttp.ClientTimeout(total=6)) as r:
+        if r.status == 200:
+          lines = (await r.text()).splitlines()
+    except Exception:
+      pass
+    rp.parse(lines)
+    _ROBOTS[host] = rp
+  return rp.can_fetch(UA, url)
+
+# Decoding wrapper for callers that need str (the article gate). Feeds go
+# through fetch_bytes directly: feedparser handles encoding itself, so the
+# charset-sniff + full decode per feed is skipped. Article pages live on
+# third-party hosts, so this path also honours their robots.txt — skipping a
+# disallowed URL up front avoids the 403/429 retry storms that would
+# otherwise burn the whole backoff schedule.
+async def fetch_text(session, url):
+  if not await allowed_by_robots(session, url):
+    return None
+  body = await fetch_bytes(session, url)
+  if body is None or body is UNCHANGED:
+    return body
+  return body.decode("utf-8", "replace")
+
 # -------- Utils --------
+@lru_cache(maxsize=8192)
 def canonical(u: str) -> str:
   if not u: return ""
   u = u.strip().replace("http://", "https://")
   u = u.split("#")[0].split("?")[0].rstrip("/")
   return u
 
+# Dedupe works on 64-bit hashes of canonical URLs rather than the strings
+# themselves: int set members are ~10x smaller and compare on the native
+# int path. Collision odds at this scale (~1e3-1e5 URLs) are negligible.
+def hash_url(u: str) -> int:
+  return int.from_bytes(hashlib.blake2b(u.encode(), digest_size=8).digest(), "big")
+
+@lru_cache(maxsize=4096)
 def to_id(url, title, dt_iso):
-  h = hashlib.sha1(f"{canonical(url)}|{title}|{dt_iso}".encode()).hexdigest()
-  return h[:12]
-
-def pick_competitor(text, url=""):
-  low = f"{text or ''} {url or ''}".lower()
-  for k, name in COMPETITOR_MAP.items():
-    if k in low:
-      return name
-  return "Unknown"
-
-def classify_tags(title, summary, url):
-  low = f"{title} {summary} {url}".lower()
-  tags = []
-  if any(k in low for k in ["ai","genai","llm","assistant","chatbot"]): tags.append("AI")
-  if any(k in low for k in ["price","pricing","bundle","license"]): tags.append("Pricing")
-  if any(k in low for k in ["rfp","tender","bid","e-bidding","procurement"]): tags.append("E-bidding")
-  if any(k in low for k in ["integration","api","webhook"]): tags.append("Integration")
-  if any(k in low for k in ["analytics","dashboard","insight"]): tags.append("Analytics")
-  if any(k in low for k in ["press","announce","launch","release"]): tags.append("Announcement")
-  return tags
-
-def severity_from(tags):
-  s = 0.0
-  if "Pricing" in tags: s += 0.35
-  if "AI" in tags: s += 0.25
-  if "E-bidding" in tags: s += 0.2
-  if "Integration" in tags: s += 0.1
-  if "Analytics" in tags: s += 0.05
+  # callers pass an already-canonical URL (collectors canonicalize on entry)
+  return hashlib.blake2b(f"{url}|{title}|{dt_iso}".encode(),
+                         digest_size=6).hexdigest()
+
+TAG_KEYWORDS = {
+  "AI": ["ai","genai","llm","assistant","chatbot"],
+  "Pricing": ["price","pricing","bundle","license"],
+  "E-bidding": ["rfp","tender","bid","e-bidding","procurement"],
+  "Integration": ["integration","api","webhook"],
+  "Analytics": ["analytics","dashboard","insight"],
+  "Announcement": ["press","announce","launch","release"],
+}
+
+# Tags travel through classification as a small bitmask; the list form is
+# only materialized when the item is yielded.
+TAG_BITS = {name: 1 << i for i, name in enumerate(TAG_KEYWORDS)}
+
+# One keyword -> (kind, label) table covering tags and competitors, compiled
+# into a single alternation so each item is scanned once instead of once per
+# keyword list. Longest-first ordering makes "kpa flex" win over "kpa".
+_KEYWORD_LABELS = {}
+for _name, _kws in TAG_KEYWORDS.items():
+  for _k in _kws: _KEYWORD_LABELS[_k] = ("tag", _name)
+for _k, _name in COMPETITOR_MAP.items():
+  _KEYWORD_LABELS[_k] = ("comp", _name)
+_KEYWORD_RX = re.compile("|".join(
+  re.escape(k) for k in sorted(_KEYWORD_LABELS, key=len, reverse=True)))
+
+def classify(title, summary, url):
+  low = f"{title or ''} {summary or ''} {url or ''}".lower()
+  comp, mask = None, 0
+  for m in _KEYWORD_RX.finditer(low):
+    kind, label = _KEYWORD_LABELS[m.group(0)]
+    if kind == "tag": mask |= TAG_BITS[label]
+    elif comp is None: comp = label
+  return comp or "Unknown", mask
+
+def tags_from(mask):
+  return [name for name, bit in TAG_BITS.items() if mask & bit]
+
+_TAG_WEIGHTS = {"Pricing": 0.35, "AI": 0.25, "E-bidding": 0.2,
+                "Integration": 0.1, "Analytics": 0.05}
+
+def _severity_of(mask):
+  s = sum(w for name, w in _TAG_WEIGHTS.items() if mask & TAG_BITS[name])
   level = "info"
   if s >= 0.75: level = "critical"
   elif s >= 0.45: level = "watch"
   return level, min(1.0, 0.5 + s)
 
+# 64 possible tag combinations -> precompute (level, score) once and make
+# severity_from a table lookup.
+_SEV_LUT = [_severity_of(m) for m in range(1 << len(TAG_BITS))]
+
+def severity_from(mask):
+  return _SEV_LUT[mask]
+
 def within_window(dt: datetime) -> bool:
   return dt >= CUTOFF
 
@@ -104,12 +261,31 @@ def parse_dt_feed(entry) -> datetime:
   for attr in ("published_parsed", "updated_parsed"):
     v = getattr(entry, attr, None)
     if v:
-      return datetime.fromtimestamp(time.mktime(v), tz=timezone.utc)
+      # feedparser's struct_time is already UTC; build the datetime directly
+      # instead of round-tripping through mktime's local-timezone conversion.
+      return datetime(*v[:6], tzinfo=timezone.utc)
   return datetime.now(timezone.utc)
 
+# URL hint: /YYYY/ segment in the path, compiled once instead of per article
+_YEAR_RX = re.compile(r"/\d{4}/")
+
+# The gate only ever looks at meta/time/JSON-LD script tags, so restrict the
+# parse to those instead of building the full document tree.
+_GATE_STRAINER = SoupStrainer(["meta", "time", "script"])
+
+# Raw-string hints that resolve most pages without building a parse tree:
+# published-time meta, og:type=article, or a JSON-LD (News)Article/BlogPosting.
+_ARTICLE_HINTS = re.compile(
+  r'article:published_time'
+  r'|content=["\']article["\']'
+  r'|"@type"\s*:\s*"(?:News)?Article"'
+  r'|BlogPosting', re.I)
+
 def looks_like_article_by_head(link: str, html: str) -> bool:
   # Quick content-based gate to avoid hub pages when discovered via Google News
-  soup = BeautifulSoup(html or "", "html.parser")
+  if html and _ARTICLE_HINTS.search(html):
+    return True
+  soup = BeautifulSoup(html or "", "lxml", parse_only=_GATE_STRAINER)
   if soup.find("meta", {"property":"article:published_time"}) or soup.find("time", attrs={"datetime": True}):
     return True
   og_type = soup.find("meta", {"property":"og:type"})
@@ -130,50 +306,75 @@ def looks_like_article_by_head(link: str, html: str) -> bool:
       continue
   # URL hint: /YYYY/ or /YYYY/MM/… slug
   path = urlparse(link).path.lower()
-  if re.search(r"/\d{4}/", path): return True
+  if _YEAR_RX.search(path): return True
   if len(path.split("/")) >= 3 and "-" in path.split("/")[-1]: return True
   return False
 
 # -------- Collectors (Google News + Business Wire) --------
-def collect_google_news():
-  for q in GOOGLE_NEWS_QUERIES:
-    url = f"https://news.google.com/rss/search?q={quote(q)}&hl=en-US&gl=US&ceid=US:en"
-    xml = fetch_text(url)
+def build_item(link, title, summary, dt, source_name):
+  # Shared record builder: classification helpers resolve once here and
+  # dt.isoformat() is computed a single time instead of once per field.
+  comp, tag_mask = classify(title, summary, link)
+  sev, score = severity_from(tag_mask)
+  dt_iso = dt.isoformat()
+  return {
+    "id": to_id(link, title or link, dt_iso),
+    "competitor": comp,
+    "title": title or link,
+    "summary": summary[:500],
+    "sourceName": source_name,
+    "sourceUrl": link,
+    "date": dt_iso,
+    "tags": tags_from(tag_mask),
+    "impact_score": round(score, 2),
+    "severity": sev,
+  }
+
+async def collect_google_news(session, seen_urls):
+  query_urls = [
+    f"https://news.google.com/rss/search?q={quote(q)}&hl=en-US&gl=US&ceid=US:en"
+    for q in GOOGLE_NEWS_QUERIES]
+  # All query feeds download concurrently instead of one per loop iteration.
+  feeds = await asyncio.gather(
+    *[fetch_bytes(session, u, track_body=True) for u in query_urls])
+  for url, xml in zip(query_urls, feeds):
+    if xml is UNCHANGED: continue  # 304: nothing new since last run
     if not xml:
       print(f"[warn] google news fetch failed: {url}")
       continue
     d = feedparser.parse(xml)
+    candidates, batch_seen = [], set()
     for e in d.entries:
       link = canonical(getattr(e, "link", "") or "")
-      title = (e.get("title","") or "").strip()
-      summary = (e.get("summary","") or "").strip()
+      # Skip known URLs up front: the orchestrator would discard them anyway,
+      # and doing it here saves the article fetch + gate parse below.
+      if not link: continue
+      hu = hash_url(link)
+      if hu in seen_urls or hu in batch_seen: continue
       dt = parse_dt_feed(e)
       if not within_window(dt): continue
+      title = (e.get("title","") or "").strip()
+      summary = (e.get("summary","") or "").strip()
+      candidates.append((link, title, summary, dt)); batch_seen.add(hu)
 
-      # Fetch the page quickly to ensure it looks like an article (avoid hubs)
-      html = fetch_text(link) or ""
+    # Fetch all candidate pages for this query concurrently; the per-host
+    # semaphore and gap in fetch_text keep the fan-out polite.
+    pages = await asyncio.gather(
+      *[fetch_text(session, c[0]) for c in candidates])
+
+    for (link, title, summary, dt), html in zip(candidates, pages):
+      # Check the page quickly to ensure it looks like an article (avoid hubs)
+      if html is UNCHANGED or not html: html = ""
       if not looks_like_article_by_head(link, html):
         continue
 
-      comp = pick_competitor(f"{title} {summary}", link)
-      tags = classify_tags(title, summary, link)
-      sev, score = severity_from(tags)
-      yield {
-        "id": to_id(link, title or link, dt.isoformat()),
-        "competitor": comp,
-        "title": title or link,
-        "summary": summary[:500],
-        "sourceName": urlparse(link).netloc or "Google News",
-        "sourceUrl": link,
-        "date": dt.isoformat(),
-        "tags": tags,
-        "impact_score": round(score, 2),
-        "severity": sev,
-      }
-
-def collect_businesswire():
+      yield build_item(link, title, summary, dt,
+                       urlparse(link).netloc or "Google News")
+
+async def collect_businesswire(session, seen_urls):
   for src in RSS_SOURCES:
-    xml = fetch_text(src["url"])
+    xml = await fetch_bytes(session, src["url"], track_body=True)
+    if xml is UNCHANGED: continue  # 304: nothing new since last run
     if not xml:
       print(f"[warn] rss fetch failed: {src['name']} :: {src['url']}")
       continue
@@ -185,62 +386,108 @@ def collect_businesswire():
         alts = [L.get("href") for L in e.links if L.get("href") and L.get("rel") in (None, "alternate")]
         if alts: link = alts[0]
       link = canonical(link or e.get("link",""))
-      title = (e.get("title","") or "").strip()
-      summary = (e.get("summary","") or "").strip()
+      if hash_url(link) in seen_urls: continue
       dt = parse_dt_feed(e)
       if not within_window(dt): continue
+      title = (e.get("title","") or "").strip()
+      summary = (e.get("summary","") or "").strip()
       # Business Wire items are individual releases; no extra hub check needed.
 
-      comp = pick_competitor(f"{title} {summary}", link)
-      tags = classify_tags(title, summary, link)
-      sev, score = severity_from(tags)
-      yield {
-        "id": to_id(link, title or link, dt.isoformat()),
-        "competitor": comp,
-        "title": title or link,
-        "summary": summary[:500],
-        "sourceName": src["name"],
-        "sourceUrl": link,
-        "date": dt.isoformat(),
-        "tags": tags,
-        "impact_score": round(score, 2),
-        "severity": sev,
-      }
+      yield build_item(link, title, summary, dt, src["name"])
 
 # -------- Orchestrate --------
-def load_existing(path):
+# The append-only JSONL file is the store of record; insights.json is the
+# sorted top-1000 view materialized for the frontend on every run.
+# One sequential scan builds the id-keyed map directly — no intermediate list.
+def load_existing():
+  items = {}
   try:
-    with open(path) as f:
-      data = json.load(f)
-      return {i["id"]: i for i in data}, data
+    with open(INSIGHTS_JSONL_PATH, "rb") as f:
+      for line in f:
+        if line.strip():
+          i = orjson.loads(line)
+          items[i["id"]] = i
+  except FileNotFoundError:
+    # first run after the migration: seed from the old JSON array
+    try:
+      with open(INSIGHTS_PATH, "rb") as f:
+        for i in orjson.loads(f.read()):
+          items[i["id"]] = i
+    except Exception:
+      pass
   except Exception:
-    return {}, []
+    pass
+  return items
 
-if __name__ == "__main__":
-  existing_map, existing_list = load_existing(INSIGHTS_PATH)
-  seen_urls = {canonical(v.get("sourceUrl")) for v in existing_list}
-  out = list(existing_list)
-  new_count = 0
+def append_insights(items):
+  with open(INSIGHTS_JSONL_PATH, "ab") as f:
+    for item in items:
+      f.write(orjson.dumps(item) + b"\n")
 
-  # Google News
-  try:
-    for item in collect_google_news():
-      if item["id"] in existing_map or canonical(item["sourceUrl"]) in seen_urls: continue
-      out.append(item); seen_urls.add(canonical(item["sourceUrl"])); new_count += 1
-  except Exception as e:
-    print(f"[warn] google news collector failed: {e}")
+async def main():
+  # id-keyed dict: O(1) upsert/dedupe, and re-reading the JSONL store can
+  # never introduce duplicate ids.
+  results = load_existing()
+  seen_urls = {hash_url(canonical(v.get("sourceUrl"))) for v in results.values()}
+  new_items = []
 
-  # Business Wire
-  try:
-    for item in collect_businesswire():
-      if item["id"] in existing_map or canonical(item["sourceUrl"]) in seen_urls: continue
-      out.append(item); seen_urls.add(canonical(item["sourceUrl"])); new_count += 1
-  except Exception as e:
-    print(f"[warn] businesswire collector failed: {e}")
-
-  out.sort(key=lambda x: x.get("date",""), reverse=True)
-  with open(INSIGHTS_PATH, "w") as f:
-    json.dump(out[:1000], f, indent=2)
-
-  print(f"New items added: {new_count}")
-  print(f"Wrote {len(out[:1000])} insights to {INSIGHTS_PATH}")
+  timeout = aiohttp.ClientTimeout(total=HTTP_TIMEOUT)
+  # Pooled connector: keep-alive reuses sockets so same-host fetches skip
+  # the TCP+TLS handshake after the first request. limit_per_host backstops
+  # the per-host semaphore at the socket level so a wide gather can never
+  # open more connections to one site than the politeness policy allows.
+  connector = aiohttp.TCPConnector(limit=32, limit_per_host=PER_HOST_CONCURRENCY,
+                                   ttl_dns_cache=300)
+  async with aiohttp.ClientSession(headers={"User-Agent": UA}, timeout=timeout,
+                                   connector=connector) as session:
+    async def consume(agen, label):
+      try:
+        async for item in agen:
+          hu = hash_url(item["sourceUrl"])  # collectors yield canonical URLs
+          if item["id"] in results or hu in seen_urls: continue
+          results[item["id"]] = item; new_items.append(item); seen_urls.add(hu)
+      except Exception as e:
+        print(f"[warn] {label} collector failed: {e}")
+
+    # Run all source classes concurrently; per-host throttling still applies
+    # inside fetch_text, and a failure in one collector doesn't stop the rest.
+    await asyncio.gather(
+      consume(collect_google_news(session, seen_urls), "google news"),
+      consume(collect_businesswire(session, seen_urls), "businesswire"),
+    )
+
+  # Append only the new rows to the store; per-run write cost is
+  # O(new items), not O(total history). The first run after the migration
+  # writes the seeded history in full so the store file always exists.
+  if not os.path.exists(INSIGHTS_JSONL_PATH):
+    append_insights(results.values())
+  elif new_items:
+    append_insights(new_items)
+
+  # Top-1000 newest first: O(N log 1000) instead of sorting everything.
+  # Every item carries a "date" (collectors always stamp it), so itemgetter
+  # is safe and avoids a per-element .get call.
+  top = heapq.nlargest(1000, results.values(), key=itemgetter("date"))
+  # Write-then-rename so a run killed mid-write can't leave the frontend
+  # with a truncated insights.json.
+  tmp = INSIGHTS_PATH + ".tmp"
+  with open(tmp, "wb") as f:
+    f.write(orjson.dumps(top, option=orjson.OPT_INDENT_2))
+  os.replace(tmp, INSIGHTS_PATH)
+
+  # Occasional compaction keeps the append-only store bounded; same atomic
+  # rename since this rewrites the store of record.
+  if len(results) > COMPACT_AT:
+    tmp = INSIGHTS_JSONL_PATH + ".tmp"
+    with open(tmp, "wb") as f:
+      for item in top:
+        f.write(orjson.dumps(item) + b"\n")
+    os.replace(tmp, INSIGHTS_JSONL_PATH)
+
+  save_http_cache()
+
+  print(f"New items added: {len(new_items)}")
+  print(f"Wrote {len(top)} insights to {INSIGHTS_PATH}")
+
+if __name__ == "__main__":
+  asyncio.run(main())